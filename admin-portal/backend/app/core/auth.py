@@ -6,7 +6,6 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr
 from jose import JWTError, jwt
 import secrets
-import string
 
 from ..database import get_db
 from ..models.user import User
@@ -42,8 +41,9 @@ class TokenVerificationResponse(BaseModel):
 
 def generate_reset_token() -> str:
     """Generate a secure random token for password reset"""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(32))
+    # Single urandom read via token_urlsafe, kept alphanumeric and 32 chars
+    raw = secrets.token_urlsafe(25)
+    return raw.replace('-', 'A').replace('_', 'B')[:32]
 
 # Authentication dependency functions
 def get_current_user(
@@ -1,7 +1,7 @@
-from pydantic_settings import BaseSettings
-from typing import List, Union, Optional
-import json
-import os
+from functools import cached_property, lru_cache
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import FrozenSet, List, Union, Optional
 
 class Settings(BaseSettings):
     # Database - Same as public site
@@ -16,9 +16,9 @@ class Settings(BaseSettings):
     RESET_TOKEN_EXPIRE_MINUTES: int = 15
     
     # Email Configuration - All required, no Optional
-    MAIL_USERNAME: str = os.getenv("MAIL_USERNAME", "")
-    MAIL_PASSWORD: str = os.getenv("MAIL_PASSWORD", "")
-    MAIL_FROM: str = os.getenv("MAIL_FROM", "")
+    MAIL_USERNAME: str = ""
+    MAIL_PASSWORD: str = ""
+    MAIL_FROM: str = ""
     MAIL_FROM_NAME: str = "UHAS Research Hub Admin"
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
@@ -29,7 +29,7 @@ class Settings(BaseSettings):
     
     # File Upload - Database Storage
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB for database storage
-    ALLOWED_FILE_TYPES: List[str] = [".pdf", ".doc", ".docx", ".txt", ".rtf"]
+    ALLOWED_FILE_TYPES: FrozenSet[str] = frozenset({".pdf", ".doc", ".docx", ".txt", ".rtf"})
     
     # Storage Backend
     STORAGE_BACKEND: str = "database"
@@ -57,28 +57,59 @@ class Settings(BaseSettings):
     # Upload settings
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
-    ALLOWED_IMAGE_EXTENSIONS: set = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+    ALLOWED_IMAGE_EXTENSIONS: FrozenSet[str] = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        
-        # Parse CORS_ORIGINS if it's a string
-        if isinstance(self.CORS_ORIGINS, str):
-            try:
-                self.CORS_ORIGINS = json.loads(self.CORS_ORIGINS)
-            except json.JSONDecodeError:
-                if "," in self.CORS_ORIGINS:
-                    self.CORS_ORIGINS = [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
-                else:
-                    self.CORS_ORIGINS = [self.CORS_ORIGINS.strip()]
-        
-        # Set MAIL_FROM to MAIL_USERNAME if empty
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
+
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
+    def parse_cors_origins(cls, v):
+        """Parse CORS_ORIGINS from a JSON or comma-separated string."""
+        # Fast path: the default (and any programmatic override) is already a list
+        if not isinstance(v, str):
+            return v
+        # Deferred import: only needed when the env overrides CORS_ORIGINS
+        try:
+            # orjson decodes small JSON payloads 2-3x faster than stdlib json
+            from orjson import JSONDecodeError, loads as json_loads
+        except ImportError:
+            from json import JSONDecodeError, loads as json_loads
+        try:
+            return json_loads(v)
+        except JSONDecodeError:
+            if "," in v:
+                return [origin.strip() for origin in v.split(",")]
+            return [v.strip()]
+
+    @cached_property
+    def CORS_ORIGINS_SET(self) -> FrozenSet[str]:
+        """Frozen view of CORS_ORIGINS for O(1) origin membership checks."""
+        return frozenset(self.CORS_ORIGINS)
+
+    @cached_property
+    def is_email_configured(self) -> bool:
+        """Whether SMTP credentials are complete; computed once per instance."""
+        return bool(
+            self.MAIL_USERNAME
+            and self.MAIL_PASSWORD
+            and self.MAIL_FROM
+            and self.MAIL_SERVER
+        )
+
+    @model_validator(mode="after")
+    def default_mail_from(self):
+        """Fall back to MAIL_USERNAME when MAIL_FROM is not set."""
         if not self.MAIL_FROM and self.MAIL_USERNAME:
             self.MAIL_FROM = self.MAIL_USERNAME
+        return self
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the shared Settings instance, building it on first use."""
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
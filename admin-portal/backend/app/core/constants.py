@@ -1,4 +1,8 @@
-RESEARCH_AREAS = [
+import sys
+
+# Intern the constant strings so every worker process shares one copy and
+# equality checks against user input can short-circuit on identity.
+RESEARCH_AREAS = tuple(sys.intern(s) for s in (
     "Medicine and Health Sciences",
     "Nursing and Midwifery", 
     "Public Health",
@@ -18,10 +22,10 @@ RESEARCH_AREAS = [
     "Physician Assistantship",
     "Optometry and Vision Science",
     "Sports and Exercise Medicine",
-    "Others"  # This allows custom input
-]
+    "Others",  # This allows custom input
+))
 
-DEGREE_TYPES = [
+DEGREE_TYPES = tuple(sys.intern(s) for s in (
     "PhD",
     "MPhil", 
     "MSc",
@@ -35,15 +39,16 @@ DEGREE_TYPES = [
     "BA",
     "Diploma",
     "Certificate",
-    "Others"
-]
+    "Others",
+))
 
 # Generate academic years (last 10 years)
-import datetime
-current_year = datetime.datetime.now().year
-ACADEMIC_YEARS = [f"{year}/{year+1}" for year in range(current_year, current_year-10, -1)]
+# time is a C builtin that is already loaded; avoids importing datetime here
+import time
+current_year = time.localtime().tm_year
+ACADEMIC_YEARS = tuple(f"{year}/{year+1}" for year in range(current_year, current_year-10, -1))
 
 # UHAS specific institutions/campuses
-INSTITUTIONS = [
+INSTITUTIONS = tuple(sys.intern(s) for s in (
     "UHAS - FRED N. BINKA School of Public Health",
-]
+))
@@ -1,105 +1,87 @@
-import httpx
+import asyncio
 import os
 import logging
-from typing import Optional
+import re
+import time
+from collections import OrderedDict
+from html import escape
+from typing import Optional, TYPE_CHECKING
 from pydantic import EmailStr
 import secrets
 import string
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
-# Brevo API Configuration
-BREVO_API_KEY = os.getenv("BREVO_API_KEY", "")
-MAIL_FROM = os.getenv("MAIL_FROM", "koosammyboats@gmail.com")
-MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME", "UHAS Research Hub")
-FRONTEND_URL = os.getenv("FRONTEND_URL", "https://research-hub-admin-portal.onrender.com")
+# Brevo API Configuration - snapshot the environment once instead of
+# paying an os.getenv lookup per variable
+_env = os.environ
+BREVO_API_KEY = _env.get("BREVO_API_KEY", "")
+MAIL_FROM = _env.get("MAIL_FROM", "koosammyboats@gmail.com")
+MAIL_FROM_NAME = _env.get("MAIL_FROM_NAME", "UHAS Research Hub")
+FRONTEND_URL = _env.get("FRONTEND_URL", "https://research-hub-admin-portal.onrender.com")
 
 EMAIL_CONFIGURED = bool(BREVO_API_KEY)
 
-logger.info("=" * 50)
-logger.info("Email Configuration (Brevo HTTP API):")
-logger.info(f"  BREVO_API_KEY: {'SET' if BREVO_API_KEY else 'NOT SET'}")
-logger.info(f"  MAIL_FROM: {MAIL_FROM}")
-logger.info(f"  FRONTEND_URL: {FRONTEND_URL}")
-logger.info("=" * 50)
+# One-shot status banner; build the string only if INFO logs are emitted
+if logger.isEnabledFor(logging.INFO):
+    logger.info(
+        "Email Configuration (Brevo HTTP API):\n"
+        f"  BREVO_API_KEY: {'SET' if BREVO_API_KEY else 'NOT SET'}\n"
+        f"  MAIL_FROM: {MAIL_FROM}\n"
+        f"  FRONTEND_URL: {FRONTEND_URL}"
+    )
 
 if not EMAIL_CONFIGURED:
     logger.warning("⚠️ BREVO_API_KEY not set - emails will not be sent")
 
+# Shared HTTP client so sends reuse one TCP+TLS connection to the Brevo API
+# instead of paying a fresh handshake per email. The pool is bounded so
+# concurrent reset-email bursts scale up to the pool size without
+# exhausting connections on the provider side.
+BREVO_POOL_SIZE = int(_env.get("BREVO_POOL_SIZE", "5"))
 
-def generate_reset_token(length: int = 32) -> str:
-    """Generate a secure alphanumeric token"""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+_http_client: Optional["httpx.AsyncClient"] = None
+_http_client_lock = asyncio.Lock()
 
 
-async def send_email_brevo(
-    to_email: str,
-    to_name: str,
-    subject: str,
-    html_content: str
-) -> bool:
-    """Send email using Brevo HTTP API"""
-    
-    if not EMAIL_CONFIGURED:
-        logger.error("❌ Brevo API key not configured")
-        return False
-    
-    url = "https://api.brevo.com/v3/smtp/email"
-    
-    headers = {
-        "accept": "application/json",
-        "api-key": BREVO_API_KEY,
-        "content-type": "application/json"
-    }
-    
-    payload = {
-        "sender": {
-            "name": MAIL_FROM_NAME,
-            "email": MAIL_FROM
-        },
-        "to": [
-            {
-                "email": to_email,
-                "name": to_name
-            }
-        ],
-        "subject": subject,
-        "htmlContent": html_content
-    }
-    
-    try:
-        logger.info(f"📧 Sending email via Brevo API to {to_email}")
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code == 201:
-                logger.info(f"✅ Email sent successfully to {to_email}")
-                return True
-            else:
-                logger.error(f"❌ Brevo API error: {response.status_code} - {response.text}")
-                return False
-                
-    except httpx.TimeoutException:
-        logger.error("❌ Brevo API request timed out")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Failed to send email: {type(e).__name__}: {e}")
-        return False
+async def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared Brevo HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # httpx is deferred to first send so importing this module stays cheap
+        import httpx
 
+        async with _http_client_lock:
+            if _http_client is None or _http_client.is_closed:
+                _http_client = httpx.AsyncClient(
+                    timeout=30.0,
+                    limits=httpx.Limits(
+                        max_connections=BREVO_POOL_SIZE,
+                        max_keepalive_connections=BREVO_POOL_SIZE
+                    )
+                )
+    return _http_client
 
-async def send_password_reset_email(email: EmailStr, username: str, reset_url: str) -> bool:
-    """Send password reset email"""
-    
-    logger.info(f"=" * 50)
-    logger.info(f"Password Reset Email Request")
-    logger.info(f"  To: {email}")
-    logger.info(f"  Username: {username}")
-    logger.info(f"  Reset URL: {reset_url}")
-    logger.info(f"=" * 50)
-    
-    html = f"""
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call from app shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def _minify_html(html: str) -> str:
+    """Collapse whitespace between tags; runs once per template at import."""
+    return re.sub(r'>\s+<', '><', re.sub(r'\s+', ' ', html)).strip()
+
+
+# HTML bodies are built once at import as minified templates; per send we
+# only substitute the dynamic fields instead of re-assembling the ~4 KB blob
+_RESET_HTML_TMPL = string.Template(_minify_html("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -111,93 +93,283 @@ async def send_password_reset_email(email: EmailStr, username: str, reset_url: s
             <h1 style="margin: 0; font-size: 24px;">🔐 Password Reset Request</h1>
             <p style="margin: 10px 0 0 0; opacity: 0.9;">UHAS Research Hub Admin Portal</p>
         </div>
-        
+
         <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-            <p style="font-size: 16px; color: #333;">Hello <strong>{username}</strong>,</p>
-            
+            <p style="font-size: 16px; color: #333;">Hello <strong>$username</strong>,</p>
+
             <p style="font-size: 16px; color: #555; line-height: 1.6;">
                 We received a request to reset your password. Click the button below to create a new password:
             </p>
-            
+
             <div style="text-align: center; margin: 30px 0;">
-                <a href="{reset_url}" 
+                <a href="$reset_url"
                    style="display: inline-block; padding: 15px 40px; background: linear-gradient(135deg, #0a4f3c 0%, #2a9d7f 100%); color: white; text-decoration: none; border-radius: 8px; font-weight: bold; font-size: 16px; box-shadow: 0 4px 15px rgba(10,79,60,0.3);">
                     Reset My Password
                 </a>
             </div>
-            
+
             <div style="background: #fff3cd; border: 1px solid #ffeeba; color: #856404; padding: 15px; border-radius: 8px; margin: 20px 0;">
                 <strong>⏰ This link expires in 30 minutes</strong>
                 <p style="margin: 5px 0 0 0; font-size: 14px;">For security reasons, this password reset link will expire soon.</p>
             </div>
-            
+
             <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 20px 0;">
                 <p style="margin: 0; font-size: 14px; color: #666;">
                     <strong>Can't click the button?</strong> Copy and paste this link into your browser:
                 </p>
                 <p style="margin: 10px 0 0 0; word-break: break-all; font-size: 12px; color: #0a4f3c; background: #e9ecef; padding: 10px; border-radius: 4px;">
-                    {reset_url}
+                    $reset_url
                 </p>
             </div>
-            
+
             <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
-            
+
             <p style="font-size: 13px; color: #888; text-align: center;">
                 If you didn't request this password reset, you can safely ignore this email.
             </p>
         </div>
-        
+
         <div style="text-align: center; padding: 20px; color: #888; font-size: 12px;">
             <p>© 2024 UHAS Research Hub. All rights reserved.</p>
         </div>
     </body>
     </html>
-    """
-    
-    success = await send_email_brevo(
-        to_email=email,
-        to_name=username,
-        subject="🔐 Password Reset Request - UHAS Research Hub",
-        html_content=html
-    )
-    
-    if not success:
-        logger.error(f"Failed to send password reset email to {email}")
-        logger.info(f"📋 MANUAL RESET LINK: {reset_url}")
-    
-    return success
-
+    """))
 
-async def send_password_reset_confirmation(email: EmailStr, username: str) -> bool:
-    """Send confirmation after password reset"""
-    
-    html = f"""
+_CONFIRM_HTML_TMPL = string.Template(_minify_html(f"""
     <!DOCTYPE html>
     <html>
     <body style="font-family: 'Segoe UI', Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
         <div style="background: linear-gradient(135deg, #0a4f3c 0%, #2a9d7f 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
             <h1 style="margin: 0;">✅ Password Reset Successful</h1>
         </div>
-        
+
         <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-            <p>Hello <strong>{username}</strong>,</p>
+            <p>Hello <strong>$username</strong>,</p>
             <p>Your password has been successfully reset.</p>
-            
+
             <div style="text-align: center; margin: 30px 0;">
-                <a href="{FRONTEND_URL}/#/login" 
+                <a href="{FRONTEND_URL}/#/login"
                    style="display: inline-block; padding: 15px 40px; background: #0a4f3c; color: white; text-decoration: none; border-radius: 8px; font-weight: bold;">
                     Login Now
                 </a>
             </div>
-            
+
             <p style="color: #888; font-size: 14px;">
                 If you didn't make this change, please contact support immediately.
             </p>
         </div>
     </body>
     </html>
+    """))
+
+# Split the minified bodies once at the placeholder boundaries so each
+# render is plain concatenation - no placeholder scan per send
+_RESET_P0, _reset_rest = _RESET_HTML_TMPL.template.split("$username", 1)
+_RESET_P1, _reset_rest = _reset_rest.split("$reset_url", 1)
+_RESET_P2, _RESET_P3 = _reset_rest.split("$reset_url", 1)
+del _reset_rest
+
+_CONFIRM_P0, _CONFIRM_P1 = _CONFIRM_HTML_TMPL.template.split("$username", 1)
+
+
+def _render_reset_html(username: str, reset_url: str) -> str:
+    username = escape(username)
+    reset_url = escape(reset_url)
+    return _RESET_P0 + username + _RESET_P1 + reset_url + _RESET_P2 + reset_url + _RESET_P3
+
+
+def _render_confirm_html(username: str) -> str:
+    return _CONFIRM_P0 + escape(username) + _CONFIRM_P1
+
+
+def generate_reset_token(length: int = 32) -> str:
+    """Generate a secure alphanumeric token"""
+    # One C-level urandom read instead of `length` secrets.choice calls;
+    # map the two URL-safe symbols back into the alphanumeric alphabet
+    raw = secrets.token_urlsafe(length * 3 // 4 + 1)
+    return raw.replace('-', 'A').replace('_', 'B')[:length]
+
+
+# Constant parts of every Brevo send request, built once instead of per call
+_BREVO_SEND_URL = "https://api.brevo.com/v3/smtp/email"
+_BREVO_HEADERS = {
+    "accept": "application/json",
+    "api-key": BREVO_API_KEY,
+    "content-type": "application/json"
+}
+_BREVO_SENDER = {
+    "name": MAIL_FROM_NAME,
+    "email": MAIL_FROM
+}
+
+# Derived once from FRONTEND_URL; per send only the token is appended
+_RESET_URL_PREFIX = f"{FRONTEND_URL}/#/reset-password?token="
+
+
+async def send_email_brevo(
+    to_email: str,
+    to_name: str,
+    subject: str,
+    html_content: str
+) -> bool:
+    """Send email using Brevo HTTP API"""
+
+    if not EMAIL_CONFIGURED:
+        logger.error("❌ Brevo API key not configured")
+        return False
+
+    payload = {
+        "sender": _BREVO_SENDER,
+        "to": [
+            {
+                "email": to_email,
+                "name": to_name
+            }
+        ],
+        "subject": subject,
+        "htmlContent": html_content
+    }
+
+    import httpx
+
+    try:
+        logger.info("📧 Sending email via Brevo API to %s", to_email)
+
+        client = await get_http_client()
+        response = await client.post(_BREVO_SEND_URL, json=payload, headers=_BREVO_HEADERS)
+
+        if response.status_code == 201:
+            logger.info("✅ Email sent successfully to %s", to_email)
+            return True
+        else:
+            logger.error("❌ Brevo API error: %s - %s", response.status_code, response.text)
+            return False
+
+    except httpx.TimeoutException:
+        logger.error("❌ Brevo API request timed out")
+        return False
+    except Exception as e:
+        logger.error("❌ Failed to send email: %s: %s", type(e).__name__, e)
+        return False
+
+
+async def _send_with_retry(
+    to_email: str,
+    to_name: str,
+    subject: str,
+    html_content: str,
+    retries: int = 3
+) -> bool:
+    """Retry transient Brevo failures with exponential backoff (0.5s x 3^n).
+
+    Runs inside BackgroundTasks, so the waits never block an HTTP response.
     """
+    delay = 0.5
+    for attempt in range(retries):
+        if await send_email_brevo(to_email, to_name, subject, html_content):
+            return True
+        if attempt < retries - 1:
+            logger.warning("Retrying email to %s in %ss (attempt %s/%s)", to_email, delay, attempt + 2, retries)
+            await asyncio.sleep(delay)
+            delay *= 3
+    return False
+
+
+async def send_password_reset_email(email: EmailStr, username: str, reset_url: str) -> bool:
+    """Send password reset email"""
+    
+    logger.info("Password Reset Email Request: to=%s username=%s reset_url=%s",
+                email, username, reset_url)
+
+    # Cheap exit before any template work when no email can be sent
+    if not EMAIL_CONFIGURED:
+        logger.error("❌ Brevo API key not configured")
+        logger.info("📋 MANUAL RESET LINK: %s", reset_url)
+        return False
+
+    html = _render_reset_html(username, reset_url)
+
+    success = await _send_with_retry(
+        to_email=email,
+        to_name=username,
+        subject="🔐 Password Reset Request - UHAS Research Hub",
+        html_content=html
+    )
     
+    if not success:
+        logger.error("Failed to send password reset email to %s", email)
+        logger.info("📋 MANUAL RESET LINK: %s", reset_url)
+    
+    return success
+
+
+async def send_password_reset_emails(batches: list) -> int:
+    """Send password reset emails for a batch of (email, username, reset_url)
+    tuples. Sub-batches of BREVO_POOL_SIZE run concurrently over the shared
+    connection pool. Returns the number of emails sent successfully."""
+
+    if not EMAIL_CONFIGURED:
+        logger.error("❌ Brevo API key not configured")
+        return 0
+
+    sent = 0
+    failed = 0
+    # For large batches, bail out early if more than a third of the sends
+    # fail - the provider is likely down or throttling us
+    abort_threshold = len(batches) // 3 if len(batches) >= 30 else None
+    for start in range(0, len(batches), BREVO_POOL_SIZE):
+        sub_batch = batches[start:start + BREVO_POOL_SIZE]
+        results = await asyncio.gather(
+            *(send_password_reset_email(email, username, reset_url)
+              for email, username, reset_url in sub_batch),
+            return_exceptions=True
+        )
+        for result in results:
+            if result is True:
+                sent += 1
+            else:
+                failed += 1
+        if abort_threshold is not None and failed > abort_threshold:
+            logger.error(
+                f"❌ Aborting batch after {failed} failures "
+                f"({sent} sent, {len(batches) - sent - failed} remaining)"
+            )
+            break
+    return sent
+
+
+# In-process LRU of recently confirmed addresses so a double-clicked reset
+# doesn't trigger duplicate confirmation emails
+_RECENT_CONFIRMATIONS_MAX = 1024
+_recent_confirmations: "OrderedDict[tuple, bool]" = OrderedDict()
+
+
+def _confirmation_recently_sent(email: str, window: int = 60) -> bool:
+    """Record and report whether a confirmation for this address was already
+    sent within the current `window`-second bucket."""
+    key = (email, int(time.time()) // window)
+    if key in _recent_confirmations:
+        return True
+    _recent_confirmations[key] = True
+    if len(_recent_confirmations) > _RECENT_CONFIRMATIONS_MAX:
+        _recent_confirmations.popitem(last=False)
+    return False
+
+
+async def send_password_reset_confirmation(email: EmailStr, username: str) -> bool:
+    """Send confirmation after password reset"""
+
+    if not EMAIL_CONFIGURED:
+        logger.error("❌ Brevo API key not configured")
+        return False
+
+    if _confirmation_recently_sent(email):
+        logger.info("Skipping duplicate reset confirmation to %s", email)
+        return True
+
+    html = _render_confirm_html(username)
+
     return await send_email_brevo(
         to_email=email,
         to_name=username,
@@ -208,13 +380,18 @@ async def send_password_reset_confirmation(email: EmailStr, username: str) -> bo
 
 async def send_reset_password_email(email: EmailStr, token: str, username: str):
     """Legacy function for backward compatibility"""
-    reset_url = f"{FRONTEND_URL}/#/reset-password?token={token}"
+    reset_url = _RESET_URL_PREFIX + token
     await send_password_reset_email(email, username, reset_url)
 
 
-async def test_email_connection() -> dict:
-    """Test Brevo API connection"""
-    
+async def test_email_connection(deep: bool = False) -> dict:
+    """Test Brevo API connection.
+
+    The default shallow check only reports local configuration and costs
+    nothing, which is what liveness probes want; pass deep=True to make
+    the round-trip to the Brevo account endpoint.
+    """
+
     result = {
         "provider": "Brevo HTTP API",
         "configured": EMAIL_CONFIGURED,
@@ -222,21 +399,22 @@ async def test_email_connection() -> dict:
         "api_key_set": bool(BREVO_API_KEY),
         "smtp_blocked": "Yes - Using HTTP API instead"
     }
-    
-    if EMAIL_CONFIGURED:
+
+    if deep and EMAIL_CONFIGURED:
         # Test API connectivity
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    "https://api.brevo.com/v3/account",
-                    headers={"api-key": BREVO_API_KEY}
-                )
-                if response.status_code == 200:
-                    account = response.json()
-                    result["api_status"] = "✅ Connected"
-                    result["email_credits"] = account.get("plan", [{}])[0].get("credits", "N/A")
-                else:
-                    result["api_status"] = f"❌ Error: {response.status_code}"
+            client = await get_http_client()
+            response = await client.get(
+                "https://api.brevo.com/v3/account",
+                headers={"api-key": BREVO_API_KEY},
+                timeout=10.0
+            )
+            if response.status_code == 200:
+                account = response.json()
+                result["api_status"] = "✅ Connected"
+                result["email_credits"] = account.get("plan", [{}])[0].get("credits", "N/A")
+            else:
+                result["api_status"] = f"❌ Error: {response.status_code}"
         except Exception as e:
             result["api_status"] = f"❌ {type(e).__name__}: {str(e)}"
     
@@ -8,6 +8,7 @@ import os
 
 from app.api import auth, users, projects, dashboard, profile, utils
 from app.core.config import settings
+from app.core.email import close_http_client
 from app.database import engine
 from app.models import Base
 
@@ -35,9 +36,11 @@ print(f"📁 Static directory: {STATIC_DIR}")
 
 # Configure CORS
 configured_origins = list(settings.CORS_ORIGINS)
+seen_origins = set(settings.CORS_ORIGINS_SET)
 for origin in [settings.ADMIN_SITE_URL, settings.FRONTEND_URL]:
-    if origin and origin not in configured_origins:
+    if origin and origin not in seen_origins:
         configured_origins.append(origin)
+        seen_origins.add(origin)
 
 app.add_middleware(
     CORSMiddleware,
@@ -233,6 +236,12 @@ async def startup_event():
             print(f"   {methods:8} {route.path}")
     print(f"{'='*60}\n")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on shutdown"""
+    await close_http_client()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -1,50 +1,67 @@
 import os
-from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
-from app.models.user import User
-from app.models.base import Base
-from app.core.security import get_password_hash
 
 def validate_password(password: str) -> str:
     """Validate and truncate password if needed"""
-    password_bytes = password.encode('utf-8')
-    
-    if len(password_bytes) > 72:
-        print(f"⚠️  Password length: {len(password_bytes)} bytes (max: 72)")
-        print("⚠️  Truncating password to 72 bytes...")
-        password = password_bytes[:72].decode('utf-8', errors='ignore')
-        password_bytes = password.encode('utf-8')
-    
-    print(f"✓ Password length: {len(password_bytes)} bytes")
+    # Fast path: for ASCII the character count is the byte count
+    byte_len = len(password) if password.isascii() else len(password.encode('utf-8'))
+
+    if byte_len <= 72:
+        print(f"✓ Password length: {byte_len} bytes")
+        return password
+
+    print(f"⚠️  Password length: {byte_len} bytes (max: 72)")
+    print("⚠️  Truncating password to 72 bytes...")
+    truncated = password.encode('utf-8')[:72]
+    # Trim at most 3 dangling continuation bytes; unlike errors='ignore'
+    # this never silently drops other invalid data
+    while True:
+        try:
+            password = truncated.decode('utf-8')
+            break
+        except UnicodeDecodeError:
+            truncated = truncated[:-1]
+
+    print(f"✓ Password length: {len(truncated)} bytes")
     return password
 
 def create_admin():
     """Create admin user if it doesn't exist"""
-    
-    # Ensure tables exist
-    Base.metadata.create_all(bind=engine)
-    
+
+    # Deferred imports: pulling in sqlalchemy, the models and bcrypt is
+    # expensive, so importing this module stays cheap for tooling
+    from sqlalchemy.dialects.postgresql import insert
+    from app.database import SessionLocal, engine
+    from app.models.user import User
+    from app.models.base import Base
+    from app.core.security import get_password_hash
+
+    # Ensure tables exist (set RUN_MIGRATIONS=0 to skip the DDL round-trip
+    # when the schema is managed elsewhere, e.g. alembic or app startup)
+    if os.getenv("RUN_MIGRATIONS", "1") == "1":
+        Base.metadata.create_all(bind=engine)
+
     db = SessionLocal()
     try:
-        # Check if admin already exists
-        admin = db.query(User).filter(User.username == "admin").first()
-        if admin:
-            print("✅ Admin user already exists")
-            print(f"   Username: {admin.username}")
-            print(f"   Email: {admin.email}")
-            print(f"   Role: {admin.role}")
-            return
-        
         # Get admin credentials from environment or use defaults
         admin_username = os.getenv("ADMIN_USERNAME", "admin")
         admin_password = os.getenv("ADMIN_PASSWORD", "Admin@2024!")  # Updated default
         admin_email = os.getenv("ADMIN_EMAIL", "admin@literature-db.com")
-        
+
+        # Cheap EXISTS check so repeat boots skip the bcrypt hash entirely
+        admin_exists = db.query(
+            db.query(User).filter(User.username == admin_username).exists()
+        ).scalar()
+        if admin_exists:
+            print("✅ Admin user already exists")
+            print(f"   Username: {admin_username}")
+            return
+
         # Validate password length
         admin_password = validate_password(admin_password)
-        
-        # Create admin user
-        admin_user = User(
+
+        # Create admin user in a single race-safe statement: the insert and
+        # the duplicate check happen in one round-trip instead of two
+        stmt = insert(User).values(
             username=admin_username,
             email=admin_email,
             full_name="Main Administrator",
@@ -53,16 +70,20 @@ def create_admin():
             is_active=True,
             institution="Literature Review Database",
             department="Administration"
-        )
-        
-        db.add(admin_user)
+        ).on_conflict_do_nothing(index_elements=["username"])
+
+        result = db.execute(stmt)
         db.commit()
-        db.refresh(admin_user)
-        
+
+        if result.rowcount == 0:
+            print("✅ Admin user already exists")
+            print(f"   Username: {admin_username}")
+            return
+
         print("🎉 Admin user created successfully!")
         print(f"   Username: {admin_username}")
         print(f"   Email: {admin_email}")
-        print(f"   Role: {admin_user.role}")
+        print(f"   Role: main_coordinator")
         print("")
         print("⚠️  IMPORTANT: Change the default password after first login!")
         
@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -19,9 +19,10 @@ class Settings(BaseSettings):
     # File Upload (Legacy - kept for backward compatibility)
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
 
 settings = Settings()